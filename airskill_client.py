@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+AirSkill client: resolve a skill_id through the two-layer index (root manifest -> group index.md -> skill .md).
+
+Caches every response in memory (LRU) and optionally on disk, both with a TTL. Stale entries are
+revalidated with If-None-Match / If-Modified-Since, so an unchanged file costs a 304 instead of a full body.
+Connections are pooled per host and reused across requests (HTTP/1.1 keep-alive).
+
+Usage:
+    from airskill_client import SkillClient
+
+    client = SkillClient()                                    # https://skill.ruska.cn
+    client = SkillClient("http://127.0.0.1:8000", cache_dir=".cache/airskill")
+    prompt = client.get_skill("memory-system/retain")
+    prompts = client.prefetch(["api-docs", "memory-system/recall"])
+
+CLI:
+    python3 airskill_client.py [--base-url URL] [--cache-dir DIR] skill_id [skill_id ...]
+"""
+
+import argparse
+import hashlib
+import http.client
+import json
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit
+
+# Links inside the manifest are always published under this origin (see build.py)
+CANONICAL_BASE = "https://skill.ruska.cn"
+DEFAULT_TTL = 300
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_TIMEOUT = 10.0
+USER_AGENT = "airskill-client/1"
+
+
+class SkillNotFound(LookupError):
+    """skill_id is not listed in the root manifest or its group index."""
+
+
+class FetchError(RuntimeError):
+    """HTTP request failed or returned an unexpected status."""
+
+
+def extract_manifest(raw: str) -> str:
+    """Manifest text from index.html (<pre> body); plain text is returned as-is."""
+    m = re.search(r"<pre>\s*([\s\S]*?)\s*</pre>", raw)
+    if not m:
+        return raw
+    return m.group(1).strip()
+
+
+def parse_index_rows(text: str) -> list[tuple[str, str, str]]:
+    """Parse a Skill ID / Direct Link / Summary table. Return [(skill_id, link, summary), ...]."""
+    rows = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line.startswith("|") or line.startswith("| :---"):
+            continue
+        parts = [p.strip() for p in line.strip("|").split("|")]
+        if len(parts) < 3 or parts[0] == "Skill ID":
+            continue
+        rows.append((parts[0], parts[1], parts[2]))
+    return rows
+
+
+class _ConnectionPool:
+    """Keep-alive connections per (scheme, host, port); safe to share between threads."""
+
+    def __init__(self, timeout: float, max_per_host: int = 8):
+        self.timeout = timeout
+        self.max_per_host = max_per_host
+        self._idle: dict[tuple[str, str, int], queue.LifoQueue] = {}
+        self._lock = threading.Lock()
+
+    def _queue(self, key: tuple[str, str, int]) -> queue.LifoQueue:
+        with self._lock:
+            if key not in self._idle:
+                self._idle[key] = queue.LifoQueue(maxsize=self.max_per_host)
+            return self._idle[key]
+
+    def _new(self, key: tuple[str, str, int]) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout)
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+    def request(self, url: str, headers: dict[str, str]) -> tuple[int, dict[str, str], bytes]:
+        """GET url; return (status, lower-cased headers, body). Retries once on a dropped idle connection.
+
+        Transport and protocol errors (http.client.HTTPException, OSError) are raised as FetchError.
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme or "http"
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname or "", port)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        idle = self._queue(key)
+        for attempt in range(2):
+            try:
+                conn = idle.get_nowait()
+                reused = True
+            except queue.Empty:
+                conn = self._new(key)
+                reused = False
+            try:
+                conn.request("GET", path, headers=headers)
+                resp = conn.getresponse()
+                body = resp.read()
+            except (http.client.RemoteDisconnected, ConnectionError, http.client.BadStatusLine) as e:
+                conn.close()
+                # A pooled connection may have been closed by the server while idle; retry on a fresh one
+                if reused and attempt == 0:
+                    continue
+                raise FetchError(f"GET {url}: {e!r}") from e
+            except (http.client.HTTPException, OSError) as e:
+                conn.close()
+                raise FetchError(f"GET {url}: {e!r}") from e
+            except Exception:
+                conn.close()
+                raise
+            resp_headers = {k.lower(): v for k, v in resp.getheaders()}
+            if resp.will_close:
+                conn.close()
+            else:
+                try:
+                    idle.put_nowait(conn)
+                except queue.Full:
+                    conn.close()
+            return resp.status, resp_headers, body
+        raise FetchError(f"GET {url}: connection dropped")
+
+    def close(self) -> None:
+        with self._lock:
+            queues = list(self._idle.values())
+            self._idle.clear()
+        for q in queues:
+            while True:
+                try:
+                    q.get_nowait().close()
+                except queue.Empty:
+                    break
+
+
+class SkillClient:
+    """
+    Fetch skills from an AirSkill registry.
+
+    base_url: where to fetch from (e.g. a local static server); links in the manifest that start with
+    CANONICAL_BASE are rewritten to it. cache_dir enables the on-disk cache (one JSON file per URL).
+    """
+
+    def __init__(
+        self,
+        base_url: str = CANONICAL_BASE,
+        cache_dir: str | os.PathLike | None = None,
+        ttl: float = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_workers: int = 8,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_workers = max_workers
+        self._pool = _ConnectionPool(timeout, max_per_host=max_workers)
+        self._memory: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "revalidated": 0, "fetched": 0}
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    # --- cache ---
+
+    def _disk_path(self, url: str) -> Path:
+        return self.cache_dir / (hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json")
+
+    def _load(self, url: str) -> dict | None:
+        with self._lock:
+            entry = self._memory.get(url)
+            if entry is not None:
+                self._memory.move_to_end(url)
+                return entry
+        if not self.cache_dir:
+            return None
+        try:
+            entry = json.loads(self._disk_path(url).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        self._remember(url, entry)
+        return entry
+
+    def _remember(self, url: str, entry: dict) -> None:
+        with self._lock:
+            self._memory[url] = entry
+            self._memory.move_to_end(url)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _store(self, url: str, entry: dict) -> None:
+        self._remember(url, entry)
+        if not self.cache_dir:
+            return
+        path = self._disk_path(url)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        if self.cache_dir:
+            for p in self.cache_dir.glob("*.json"):
+                p.unlink(missing_ok=True)
+
+    # --- fetching ---
+
+    def resolve_url(self, link: str) -> str:
+        """Map a manifest Direct Link (or a path like /skills/x.md) onto base_url."""
+        if link.startswith(CANONICAL_BASE):
+            return self.base_url + link[len(CANONICAL_BASE):]
+        if link.startswith("/"):
+            return self.base_url + link
+        return link
+
+    def fetch(self, url: str) -> str:
+        """GET url through the cache. Fresh entries are served locally; stale ones are revalidated."""
+        entry = self._load(url)
+        now = time.time()
+        if entry is not None and now - entry["fetched_at"] < self.ttl:
+            self._count("hits")
+            return entry["body"]
+
+        headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "identity"}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        status, resp_headers, body = self._pool.request(url, headers)
+        if status == 304 and entry is not None:
+            entry = dict(entry, fetched_at=now)
+            self._store(url, entry)
+            self._count("revalidated")
+            return entry["body"]
+        if status != 200:
+            raise FetchError(f"GET {url}: HTTP {status}")
+        entry = {
+            "url": url,
+            "etag": resp_headers.get("etag", ""),
+            "last_modified": resp_headers.get("last-modified", ""),
+            "fetched_at": now,
+            "body": body.decode("utf-8", errors="replace"),
+        }
+        self._store(url, entry)
+        self._count("fetched")
+        return entry["body"]
+
+    # --- two-layer index ---
+
+    def root_rows(self) -> list[tuple[str, str, str]]:
+        """Rows of the root manifest (single skills and group entries)."""
+        return parse_index_rows(extract_manifest(self.fetch(self.base_url + "/")))
+
+    def group_rows(self, group: str) -> list[tuple[str, str, str]]:
+        """Rows of skills/<group>/index.md."""
+        for skill_id, link, _summary in self.root_rows():
+            if skill_id == group and link.endswith("/index.md"):
+                return parse_index_rows(self.fetch(self.resolve_url(link)))
+        raise SkillNotFound(f"group not in manifest: {group}")
+
+    def resolve(self, skill_id: str) -> str:
+        """Return the fetchable URL for skill_id (e.g. api-docs, memory-system/retain)."""
+        skill_id = skill_id.strip().strip("/")
+        if "/" not in skill_id:
+            for sid, link, _summary in self.root_rows():
+                if sid == skill_id:
+                    return self.resolve_url(link)
+            raise SkillNotFound(f"skill not in manifest: {skill_id}")
+        group = skill_id.split("/", 1)[0]
+        for sid, link, _summary in self.group_rows(group):
+            if sid == skill_id:
+                return self.resolve_url(link)
+        raise SkillNotFound(f"skill not in {group}/index.md: {skill_id}")
+
+    def get_skill(self, skill_id: str) -> str:
+        """Fetch a skill's content (to be used as System Prompt)."""
+        return self.fetch(self.resolve(skill_id))
+
+    def list_skills(self) -> list[tuple[str, str, str]]:
+        """Every leaf skill reachable from the manifest, group indices expanded."""
+        out = []
+        for sid, link, summary in self.root_rows():
+            if link.endswith("/index.md"):
+                out.extend(parse_index_rows(self.fetch(self.resolve_url(link))))
+            else:
+                out.append((sid, link, summary))
+        return out
+
+    def prefetch(self, skill_ids: list[str]) -> dict[str, str | Exception]:
+        """Fetch several skills concurrently. Returns skill_id -> content, or the exception raised for it."""
+        if not skill_ids:
+            return {}
+        # Warm the root manifest and each group index once instead of racing on them. A failure here is not fatal:
+        # each skill's own lookup below retries and records the error for that skill.
+        try:
+            self.root_rows()
+            for group in sorted({s.split("/", 1)[0] for s in skill_ids if "/" in s}):
+                try:
+                    self.group_rows(group)
+                except (SkillNotFound, FetchError):
+                    pass
+        except FetchError:
+            pass
+
+        def one(skill_id: str) -> str | Exception:
+            try:
+                return self.get_skill(skill_id)
+            except (SkillNotFound, FetchError, OSError) as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as ex:
+            return dict(zip(skill_ids, ex.map(one, skill_ids)))
+
+    def close(self) -> None:
+        self._pool.close()
+
+    def __enter__(self) -> "SkillClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Fetch AirSkill skills by skill_id (cached, revalidated)")
+    ap.add_argument("skill_ids", nargs="+", help="e.g. api-docs memory-system/retain")
+    ap.add_argument("--base-url", default=CANONICAL_BASE, help=f"registry origin (default {CANONICAL_BASE})")
+    ap.add_argument("--cache-dir", default=None, help="on-disk cache directory")
+    ap.add_argument("--ttl", type=float, default=DEFAULT_TTL, help="seconds before a cached entry is revalidated")
+    args = ap.parse_args()
+
+    with SkillClient(args.base_url, cache_dir=args.cache_dir, ttl=args.ttl) as client:
+        try:
+            results = client.prefetch(args.skill_ids)
+        except (FetchError, OSError) as e:
+            print(f"ERROR {e}", file=sys.stderr)
+            return 1
+        failed = 0
+        for skill_id in args.skill_ids:
+            res = results[skill_id]
+            if isinstance(res, Exception):
+                print(f"{skill_id}: ERROR {res}", file=sys.stderr)
+                failed += 1
+                continue
+            print(f"===== {skill_id} =====")
+            print(res.rstrip())
+        print("cache:", client.stats, file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,24 @@
 #!/usr/bin/env python3
+import argparse
+import hashlib
+import json
 import os
+import shutil
+import time
 from pathlib import Path
 
+from registry import Registry, extract_summary  # noqa: F401  (extract_summary re-exported for callers of build)
+
 ROOT = Path(__file__).resolve().parent
 SKILLS_DIR = ROOT / "skills"
 TEMPLATE_PATH = ROOT / "templates" / "manifest_template.txt"
 OUTPUT_PATH = ROOT / "index.html"
 CNAME_PATH = ROOT / "CNAME"
+DIST_DIR = ROOT / "dist"
+# Hex digits of sha256 used in content-addressed paths (dist/h/<hash>/<name>)
+HASH_LEN = 16
+# Mutable files the last --dist build wrote; the only files a later build may prune
+DIST_LISTING = ".dist-files"
 
 # Optional: load .env for GEMINI_API_KEY (for AI-generated group summary)
 _env = ROOT / ".env"
@@ -18,20 +30,6 @@ if _env.is_file():
         pass
 
 
-def extract_summary(content: str) -> str:
-    lines = [line.strip() for line in content.splitlines()]
-    after_header = False
-    for line in lines:
-        if not line:
-            continue
-        if line.lower().startswith("system prompt"):
-            after_header = True
-            continue
-        if after_header:
-            return line.replace("|", " / ")
-    return ""
-
-
 def generate_group_summary_ai(group_name: str, rows: list) -> str:
     """
     Use Gemini to generate a short group summary from all sub-skill summaries.
@@ -87,73 +85,340 @@ Task: Write a single English sentence (max 200 characters) that summarizes what
         )
 
 
-def build_skill_list() -> str:
-    skill_paths = sorted(Path(SKILLS_DIR).rglob("*.md"))
-    skill_paths = [p for p in skill_paths if p.name != "index.md"]
+def collect_skills() -> tuple[list, dict]:
+    """Query the registry (synced from skills/). Return (root_rows, groups_data): root rows are (skill_id, link, summary); groups_data maps group -> rows."""
+    with Registry(skills_dir=SKILLS_DIR) as reg:
+        reg.sync()
+        records = reg.skills()
 
     root_rows = []
     groups_data = {}  # group -> list of (skill_id, link, summary)
 
-    for path in skill_paths:
-        rel = path.relative_to(SKILLS_DIR)
-        parts = rel.parts
-        skill_id = str(rel.with_suffix("")).replace(os.sep, "/")
-        link = f"https://skill.ruska.cn/skills/{rel.as_posix()}"
-        content = path.read_text(encoding="utf-8")
-        summary = extract_summary(content)
-        row = (skill_id, link, summary)
-        if len(parts) == 1:
-            root_rows.append(f"| {skill_id} | {link} | {summary} |")
+    for rec in records:
+        link = f"https://skill.ruska.cn/skills/{rec['rel_path']}"
+        row = (rec["skill_id"], link, rec["summary"])
+        if not rec["grp"]:
+            root_rows.append(row)
         else:
-            group = parts[0]
+            group = rec["grp"]
             if group not in groups_data:
                 groups_data[group] = []
             groups_data[group].append(row)
+    return root_rows, groups_data
 
-    write_group_indices(groups_data)
 
+def group_summary(group: str, rows: list) -> str:
+    overview = next((r for r in rows if r[0] == f"{group}/overview"), None)
+    if overview:
+        return overview[2]
+    # No overview: must use AI-generated summary (covers all sub-skills); no fallback
+    return generate_group_summary_ai(group, rows)
+
+
+def render_skill_list(root_rows: list, groups_data: dict, summaries: dict | None = None) -> str:
+    """summaries: optional group -> summary already computed (watch mode); missing groups are computed here."""
     table_header = "| Skill ID | Direct Link | Summary |\n| :--- | :--- | :--- |"
     lines = [table_header]
-    lines.extend(root_rows)
+    lines.extend(f"| {skill_id} | {link} | {summary} |" for skill_id, link, summary in root_rows)
     for g in sorted(groups_data.keys()):
         index_link = f"https://skill.ruska.cn/skills/{g}/index.md"
-        overview = next((r for r in groups_data[g] if r[0] == f"{g}/overview"), None)
-        if overview:
-            summary = overview[2]
+        if summaries is not None and g in summaries:
+            summary = summaries[g]
         else:
-            # No overview: must use AI-generated summary (covers all sub-skills); no fallback
-            summary = generate_group_summary_ai(g, groups_data[g])
+            summary = group_summary(g, groups_data[g])
         lines.append(f"| {g} | {index_link} | {summary} |")
     return "\n".join(lines)
 
 
-def write_group_indices(groups_data: dict) -> None:
-    base = "https://skill.ruska.cn/skills"
+def build_skill_list() -> str:
+    root_rows, groups_data = collect_skills()
+    write_group_indices(groups_data)
+    return render_skill_list(root_rows, groups_data)
+
+
+def render_group_index(group: str, rows: list) -> str:
     table_header = "| Skill ID | Direct Link | Summary |\n| :--- | :--- | :--- |"
+    body = [
+        "System Prompt:",
+        f"You are in the **{group}** skill group. This is the second-layer index. Choose a sub-skill and fetch its Direct Link; treat that content as a System Prompt.",
+        "",
+        "## Sub-skills",
+        table_header,
+    ]
+    for skill_id, link, summary in sorted(rows, key=lambda r: r[0]):
+        body.append(f"| {skill_id} | {link} | {summary} |")
+    return "\n".join(body) + "\n"
+
+
+def write_group_indices(groups_data: dict) -> None:
     for group, rows in groups_data.items():
         index_path = SKILLS_DIR / group / "index.md"
         index_path.parent.mkdir(parents=True, exist_ok=True)
-        body = [
-            "System Prompt:",
-            f"You are in the **{group}** skill group. This is the second-layer index. Choose a sub-skill and fetch its Direct Link; treat that content as a System Prompt.",
-            "",
-            "## Sub-skills",
-            table_header,
-        ]
-        for skill_id, link, summary in sorted(rows, key=lambda r: r[0]):
-            body.append(f"| {skill_id} | {link} | {summary} |")
-        index_path.write_text("\n".join(body) + "\n", encoding="utf-8")
-
+        index_path.write_text(render_group_index(group, rows), encoding="utf-8")
 
-def main() -> None:
-    CNAME_PATH.write_text("skill.ruska.cn\n", encoding="utf-8")
 
+def render_index_html(skill_list: str) -> str:
     template = TEMPLATE_PATH.read_text(encoding="utf-8")
-    skill_list = build_skill_list()
     manifest = template.replace("{{SKILL_LIST}}", skill_list)
+    return "<pre>\n" + manifest + "\n</pre>\n"
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _place(dest: Path, data: bytes, digest: str, obj: Path | None, stats: dict) -> None:
+    """Write data to dest unless it already holds the same bytes; hard-link from obj when possible."""
+    if dest.is_file():
+        # Already linked to the object: nothing to compare
+        same = obj is not None and os.path.samefile(dest, obj)
+        if same or (dest.stat().st_size == len(data) and content_hash(dest.read_bytes()) == digest):
+            stats["unchanged"] += 1
+            return
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(dest.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+    if obj is not None:
+        try:
+            os.link(obj, tmp)
+            stats["linked"] += 1
+        except OSError:
+            shutil.copyfile(obj, tmp)
+            stats["written"] += 1
+    else:
+        tmp.write_bytes(data)
+        stats["written"] += 1
+    os.replace(tmp, dest)
+
+
+def _put_object(dist: Path, rel: str, data: bytes, digest: str, stats: dict) -> tuple[str, Path]:
+    """Store data at its content-hash path (dist/h/<hash>/<name>). Return (url path, file path)."""
+    name = Path(rel).name
+    url_path = f"h/{digest[:HASH_LEN]}/{name}"
+    obj = dist / url_path
+    if obj.is_file():
+        stats["unchanged"] += 1
+    else:
+        obj.parent.mkdir(parents=True, exist_ok=True)
+        tmp = obj.with_name(obj.name + ".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, obj)
+        stats["written"] += 1
+    return "/" + url_path, obj
+
+
+def build_dist(dist: Path = DIST_DIR) -> dict:
+    """
+    Emit the site into dist/ without touching the source tree.
+
+    - dist/index.html, dist/CNAME, dist/skills/** : same URLs as the live site (mutable, revalidate).
+    - dist/h/<hash>/<name>.md : content-addressed copy of every skill and group index (cache forever).
+    - dist/manifest.json : pointer manifest, skill_id / group -> hashed path. Small and mutable.
+    Unchanged files are skipped; mutable copies are hard-linked to their hashed object. The mutable files written
+    are recorded in dist/.dist-files, and only files listed there by an earlier build are ever removed.
+    """
+    dist = dist.resolve()
+    if dist == ROOT or dist in ROOT.parents or dist == SKILLS_DIR or SKILLS_DIR in dist.parents:
+        raise SystemExit(f"refusing to build into {dist}: it is or contains the source tree")
+    stats = {"written": 0, "linked": 0, "unchanged": 0, "removed": 0}
+    dist.mkdir(parents=True, exist_ok=True)
+    root_rows, groups_data = collect_skills()
+    produced = set()
+    pointers = {"version": 1, "base_url": "https://skill.ruska.cn", "skills": {}, "groups": {}}
 
-    html = "<pre>\n" + manifest + "\n</pre>\n"
-    OUTPUT_PATH.write_text(html, encoding="utf-8")
+    def emit(rel: str, data: bytes, digest: str | None = None) -> dict:
+        digest = digest or content_hash(data)
+        url_path, obj = _put_object(dist, rel, data, digest, stats)
+        _place(dist / rel, data, digest, obj, stats)
+        produced.add(rel)
+        return {"path": url_path, "sha256": digest, "size": len(data)}
+
+    with Registry(skills_dir=SKILLS_DIR) as reg:
+        records = reg.skills()
+    for rec in records:
+        rel = f"skills/{rec['rel_path']}"
+        url_path = f"h/{rec['sha256'][:HASH_LEN]}/{Path(rel).name}"
+        obj, dest = dist / url_path, dist / rel
+        if obj.is_file() and dest.is_file() and os.path.samefile(dest, obj):
+            # Hash known from the registry and already in place: skip reading the source
+            stats["unchanged"] += 2
+            produced.add(rel)
+            pointers["skills"][rec["skill_id"]] = {"path": "/" + url_path, "sha256": rec["sha256"], "size": rec["size"]}
+            continue
+        pointers["skills"][rec["skill_id"]] = emit(rel, (SKILLS_DIR / rec["rel_path"]).read_bytes(), rec["sha256"])
+    for group, rows in sorted(groups_data.items()):
+        data = render_group_index(group, rows).encode("utf-8")
+        pointers["groups"][group] = emit(f"skills/{group}/index.md", data)
+
+    html = render_index_html(render_skill_list(root_rows, groups_data)).encode("utf-8")
+    pointers["index"] = emit("index.html", html)
+    cname = b"skill.ruska.cn\n"
+    _place(dist / "CNAME", cname, content_hash(cname), None, stats)
+    produced.add("CNAME")
+    manifest = json.dumps(pointers, ensure_ascii=False, indent=2, sort_keys=True).encode("utf-8") + b"\n"
+    _place(dist / "manifest.json", manifest, content_hash(manifest), None, stats)
+    produced.add("manifest.json")
+
+    # Drop mutable files of deleted skills/groups, but only ones a previous build listed; hashed objects are kept
+    # for clients still holding old pointers, and anything else in the target is left alone
+    listing = dist / DIST_LISTING
+    try:
+        previous = set(listing.read_text(encoding="utf-8").splitlines())
+    except FileNotFoundError:
+        previous = set()
+    for rel in sorted(previous - produced):
+        parts = Path(rel).parts
+        if not rel or Path(rel).is_absolute() or ".." in parts or parts[0] == "h":
+            continue
+        path = dist / rel
+        if path.is_file():
+            path.unlink()
+            stats["removed"] += 1
+        for parent in path.parents:
+            if parent == dist or not parent.is_dir() or any(parent.iterdir()):
+                break
+            parent.rmdir()
+    listing.write_text("".join(f"{rel}\n" for rel in sorted(produced)), encoding="utf-8")
+    return stats
+
+
+def _watch_snapshot() -> dict:
+    """rel path -> (mtime_ns, size) for authored files: skills/**/*.md (generated index.md excluded) and the template."""
+    snap = {}
+    for dirpath, dirnames, filenames in os.walk(SKILLS_DIR):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        for name in filenames:
+            if not name.endswith(".md") or name == "index.md":
+                continue
+            path = Path(dirpath, name)
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                # Deleted (or renamed by an editor's atomic save) during the walk
+                continue
+            snap[path.relative_to(ROOT).as_posix()] = (st.st_mtime_ns, st.st_size)
+    try:
+        st = TEMPLATE_PATH.stat()
+        snap[TEMPLATE_PATH.relative_to(ROOT).as_posix()] = (st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        pass
+    return snap
+
+
+def _write_if_changed(path: Path, text: str) -> bool:
+    if path.is_file() and path.read_text(encoding="utf-8") == text:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return True
+
+
+def watch(interval: float = 0.5, debounce: float = 0.3) -> None:
+    """
+    Poll skills/ and the manifest template; after a burst of changes settles (debounce), rebuild only what it touched:
+    the touched groups' index.md, their root manifest rows (group summary recomputed only if the group's rows changed),
+    or the whole manifest when the template changed. Logs rebuild latency per change. A failed rebuild (bad file,
+    AI summary error) is logged and the watcher keeps running; the next change retries everything since the last good build.
+    """
+    template_rel = TEMPLATE_PATH.relative_to(ROOT).as_posix()
+    CNAME_PATH.write_text("skill.ruska.cn\n", encoding="utf-8")
+    t0 = time.perf_counter()
+    root_rows, groups_data = collect_skills()
+    write_group_indices(groups_data)
+    summaries = {g: group_summary(g, rows) for g, rows in groups_data.items()}
+    OUTPUT_PATH.write_text(render_index_html(render_skill_list(root_rows, groups_data, summaries)), encoding="utf-8")
+    print(f"[watch] initial build: {len(groups_data)} groups in {(time.perf_counter() - t0) * 1000:.0f} ms; watching {SKILLS_DIR.relative_to(ROOT)}/ and {template_rel} (Ctrl+C to stop)")
+
+    snap = _watch_snapshot()
+    # Tree state whose rebuild failed; not retried until something changes again
+    failed = None
+    try:
+        while True:
+            time.sleep(interval)
+            current = _watch_snapshot()
+            if current == snap or current == failed:
+                continue
+            first_seen = time.perf_counter()
+            # Debounce: wait until the tree stops changing (editors often write several times per save)
+            while True:
+                time.sleep(debounce)
+                settled = _watch_snapshot()
+                if settled == current:
+                    break
+                current = settled
+            changed = {p for p in current.keys() | snap.keys() if current.get(p) != snap.get(p)}
+
+            started = time.perf_counter()
+            template_changed = template_rel in changed
+            touched = set()
+            for rel in changed:
+                parts = rel.split("/")
+                if parts[0] == SKILLS_DIR.name and len(parts) > 2:
+                    touched.add(parts[1])
+
+            new_summaries = dict(summaries)
+            rewritten = []
+            try:
+                new_root, new_groups = collect_skills()
+                for g in sorted(touched):
+                    if g not in new_groups:
+                        # Group deleted: drop its stale generated index
+                        stale = SKILLS_DIR / g / "index.md"
+                        if stale.is_file():
+                            stale.unlink()
+                            rewritten.append(f"-{g}/index.md")
+                        if (SKILLS_DIR / g).is_dir() and not any((SKILLS_DIR / g).iterdir()):
+                            (SKILLS_DIR / g).rmdir()
+                        new_summaries.pop(g, None)
+                        continue
+                    if _write_if_changed(SKILLS_DIR / g / "index.md", render_group_index(g, new_groups[g])):
+                        rewritten.append(f"{g}/index.md")
+                    if sorted(new_groups[g]) != sorted(groups_data.get(g, [])) or g not in new_summaries:
+                        new_summaries[g] = group_summary(g, new_groups[g])
+                root_changed = new_root != root_rows or touched or template_changed
+                if root_changed and _write_if_changed(
+                    OUTPUT_PATH, render_index_html(render_skill_list(new_root, new_groups, new_summaries))
+                ):
+                    rewritten.append(OUTPUT_PATH.name + (" (template)" if template_changed else ""))
+            except (Exception, SystemExit) as e:
+                # Keep the last good state: the next save is diffed against it, so nothing from this change is lost
+                failed = current
+                print(f"[watch] {len(changed)} file(s) changed -> rebuild failed, will retry on next change: {e}", flush=True)
+                continue
+            snap, failed = current, None
+            root_rows, groups_data, summaries = new_root, new_groups, new_summaries
+
+            done = time.perf_counter()
+            print(
+                f"[watch] {len(changed)} file(s) changed -> rebuilt {', '.join(rewritten) or 'nothing'} "
+                f"in {(done - started) * 1000:.0f} ms (latency since change detected {(done - first_seen) * 1000:.0f} ms)",
+                flush=True,
+            )
+    except KeyboardInterrupt:
+        print("[watch] stopped")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Build the AirSkill manifest and group indices")
+    ap.add_argument(
+        "--dist", nargs="?", const=DIST_DIR, type=Path, default=None,
+        help=f"emit a separate output directory with content-hash paths (default {DIST_DIR.name}/) instead of writing into the source tree",
+    )
+    ap.add_argument("--watch", action="store_true", help="keep running; rebuild only affected groups when skills/ or the template change")
+    ap.add_argument("--interval", type=float, default=0.5, help="watch: polling interval in seconds")
+    ap.add_argument("--debounce", type=float, default=0.3, help="watch: quiet period before rebuilding after a change")
+    args = ap.parse_args()
+
+    if args.dist is not None:
+        stats = build_dist(args.dist.resolve())
+        print(f"dist: {args.dist} — written {stats['written']}, linked {stats['linked']}, unchanged {stats['unchanged']}, removed {stats['removed']}")
+        return
+    if args.watch:
+        watch(args.interval, args.debounce)
+        return
+
+    CNAME_PATH.write_text("skill.ruska.cn\n", encoding="utf-8")
+    OUTPUT_PATH.write_text(render_index_html(build_skill_list()), encoding="utf-8")
 
 
 if __name__ == "__main__":
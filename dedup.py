@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate skill detection: MinHash signatures over word shingles, banded LSH for candidate lookup.
+
+Signatures and LSH buckets live next to the registry tables in .airskill.db and are refreshed
+incrementally (only skills whose sha256 changed are re-hashed), so checking a new skill costs
+BANDS indexed lookups regardless of corpus size. The first refresh() signs the whole corpus: about
+5-10 ms per skill in pure Python (10-15 minutes at 100k skills). numpy, an optional dependency not
+listed in any requirements file, speeds up signing when installed and gives identical signatures.
+
+Usage:
+    from dedup import DedupIndex
+    from registry import Registry
+
+    with Registry() as reg:
+        reg.sync()
+        index = DedupIndex(reg)
+        index.refresh()
+        index.query(text)                  # [(skill_id, similarity), ...] above threshold
+
+CLI:
+    python3 dedup.py scan [--threshold 0.8]                   # near-duplicate pairs in the current corpus
+    python3 dedup.py check [--threshold 0.8] FILE [FILE ...]  # compare files against the corpus
+"""
+
+import argparse
+import hashlib
+import random
+import re
+import sys
+from array import array
+from pathlib import Path
+
+from registry import SKILLS_DIR, Registry
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NUM_PERM = 128
+# BANDS * ROWS == NUM_PERM; LSH threshold ≈ (1/BANDS) ** (1/ROWS) ≈ 0.71
+BANDS = 16
+ROWS = 8
+SHINGLE_SIZE = 5
+DEFAULT_THRESHOLD = 0.8
+# Candidates come only from shared buckets: pairs much below the LSH threshold are almost never found,
+# so lower thresholds are rejected rather than silently missing matches
+MIN_THRESHOLD = round((1 / BANDS) ** (1 / ROWS), 2)
+# Smallest prime above 2**32; a < 2**31 and x < 2**32 keep a*x+b inside uint64 for numpy
+_PRIME = 4294967311
+_MASK = 0xFFFFFFFF
+_rng = random.Random(20240601)
+_A = [_rng.randrange(1, 1 << 31) for _ in range(NUM_PERM)]
+_B = [_rng.randrange(0, 1 << 32) for _ in range(NUM_PERM)]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS minhash (
+    skill_id TEXT PRIMARY KEY,
+    sha256   TEXT NOT NULL,
+    sig      BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS minhash_bands (
+    band     INTEGER NOT NULL,
+    bucket   INTEGER NOT NULL,
+    skill_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS minhash_bands_lookup ON minhash_bands (band, bucket);
+CREATE INDEX IF NOT EXISTS minhash_bands_skill ON minhash_bands (skill_id);
+"""
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+|[一-鿿]")
+
+
+def shingles(text: str, k: int = SHINGLE_SIZE) -> set[int]:
+    """32-bit hashes of k-token shingles. Latin text is tokenized by word, CJK by character."""
+    body = re.sub(r"^\s*system\s+prompt\s*:\s*", "", text, flags=re.IGNORECASE)
+    tokens = _TOKEN_RE.findall(body.lower())
+    if not tokens:
+        return set()
+    if len(tokens) <= k:
+        grams = [" ".join(tokens)]
+    else:
+        grams = [" ".join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)]
+    return {int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=4).digest(), "little") for g in grams}
+
+
+def signature(hashes: set[int]) -> array:
+    """MinHash signature (NUM_PERM unsigned 32-bit values)."""
+    if not hashes:
+        return array("I", [_MASK] * NUM_PERM)
+    if np is not None:
+        x = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+        a = np.array(_A, dtype=np.uint64)[:, None]
+        b = np.array(_B, dtype=np.uint64)[:, None]
+        mins = ((a * x + b) % np.uint64(_PRIME)).min(axis=1) & np.uint64(_MASK)
+        return array("I", mins.astype(np.uint32).tobytes())
+    return array("I", [min((a * x + b) % _PRIME for x in hashes) & _MASK for a, b in zip(_A, _B)])
+
+
+def similarity(sig_a: array, sig_b: array) -> float:
+    """Estimated Jaccard similarity of the two shingle sets."""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+def band_buckets(sig: array) -> list[int]:
+    """One bucket id per band (signed 64-bit so it fits an SQLite INTEGER)."""
+    raw = sig.tobytes()
+    width = ROWS * sig.itemsize
+    return [
+        int.from_bytes(hashlib.blake2b(raw[i * width:(i + 1) * width], digest_size=8).digest(), "little", signed=True)
+        for i in range(BANDS)
+    ]
+
+
+def text_signature(text: str) -> array:
+    return signature(shingles(text))
+
+
+def check_threshold(value: float) -> float:
+    if not MIN_THRESHOLD <= value <= 1:
+        raise ValueError(
+            f"threshold {value} outside [{MIN_THRESHOLD}, 1]: LSH with {BANDS} bands x {ROWS} rows cannot find pairs below {MIN_THRESHOLD}"
+        )
+    return value
+
+
+def threshold_arg(value: str) -> float:
+    """argparse type for --threshold / --dup-threshold."""
+    try:
+        return check_threshold(float(value))
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
+def merge_skill_text(existing: str, new: str) -> str:
+    """Keep the existing skill; append lines from the new one that it does not already contain."""
+    seen = {re.sub(r"\s+", " ", line).strip().lower() for line in existing.splitlines()}
+    extra = []
+    for line in new.splitlines():
+        key = re.sub(r"\s+", " ", line).strip().lower()
+        if not key or key in seen or key.startswith("system prompt"):
+            continue
+        seen.add(key)
+        extra.append(line.rstrip())
+    if not extra:
+        return existing
+    return existing.rstrip("\n") + "\n\nAdditional notes (merged):\n" + "\n".join(extra) + "\n"
+
+
+class DedupIndex:
+    """MinHash/LSH index over the registry's skills (group index.md excluded)."""
+
+    def __init__(self, registry: Registry, threshold: float = DEFAULT_THRESHOLD):
+        self.registry = registry
+        self.conn = registry.conn
+        self.threshold = check_threshold(threshold)
+        self.conn.executescript(SCHEMA)
+
+    def refresh(self) -> dict:
+        """Sign new/changed skills and drop signatures of removed ones. Call after Registry.sync()."""
+        stats = {"signed": 0, "removed": 0, "unchanged": 0}
+        current = {
+            r["skill_id"]: (r["sha256"], r["rel_path"])
+            for r in self.conn.execute("SELECT skill_id, sha256, rel_path FROM skills WHERE is_index = 0")
+        }
+        stored = dict(self.conn.execute("SELECT skill_id, sha256 FROM minhash").fetchall())
+        with self.conn:
+            stale = [sid for sid, sha in stored.items() if current.get(sid, (None,))[0] != sha]
+            for sid in stale:
+                self.conn.execute("DELETE FROM minhash WHERE skill_id = ?", (sid,))
+                self.conn.execute("DELETE FROM minhash_bands WHERE skill_id = ?", (sid,))
+            stats["removed"] = sum(1 for sid in stale if sid not in current)
+            for sid, (sha, rel) in current.items():
+                if stored.get(sid) == sha:
+                    stats["unchanged"] += 1
+                    continue
+                text = (self.registry.skills_dir / rel).read_text(encoding="utf-8", errors="replace")
+                self._insert(sid, sha, text_signature(text))
+                stats["signed"] += 1
+        return stats
+
+    def _insert(self, skill_id: str, sha: str, sig: array) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO minhash (skill_id, sha256, sig) VALUES (?, ?, ?)", (skill_id, sha, sig.tobytes())
+        )
+        self.conn.executemany(
+            "INSERT INTO minhash_bands (band, bucket, skill_id) VALUES (?, ?, ?)",
+            [(band, bucket, skill_id) for band, bucket in enumerate(band_buckets(sig))],
+        )
+
+    def _load_sig(self, skill_id: str) -> array | None:
+        row = self.conn.execute("SELECT sig FROM minhash WHERE skill_id = ?", (skill_id,)).fetchone()
+        if row is None:
+            return None
+        sig = array("I")
+        sig.frombytes(row[0])
+        return sig
+
+    def candidates(self, sig: array) -> set[str]:
+        """Skill ids sharing at least one LSH bucket with sig."""
+        found = set()
+        for band, bucket in enumerate(band_buckets(sig)):
+            found.update(
+                r[0] for r in self.conn.execute(
+                    "SELECT skill_id FROM minhash_bands WHERE band = ? AND bucket = ?", (band, bucket)
+                )
+            )
+        return found
+
+    def query_signature(self, sig: array, exclude: set[str] = frozenset()) -> list[tuple[str, float]]:
+        """[(skill_id, similarity), ...] at or above threshold, most similar first."""
+        out = []
+        for sid in self.candidates(sig) - set(exclude):
+            other = self._load_sig(sid)
+            if other is None:
+                continue
+            sim = similarity(sig, other)
+            if sim >= self.threshold:
+                out.append((sid, sim))
+        return sorted(out, key=lambda x: (-x[1], x[0]))
+
+    def query(self, text: str, exclude: set[str] = frozenset()) -> list[tuple[str, float]]:
+        return self.query_signature(text_signature(text), exclude)
+
+    def pairs(self) -> list[tuple[str, str, float]]:
+        """Every near-duplicate pair in the corpus (via shared buckets, not all-pairs)."""
+        by_bucket: dict[tuple[int, int], list[str]] = {}
+        for band, bucket, sid in self.conn.execute("SELECT band, bucket, skill_id FROM minhash_bands"):
+            by_bucket.setdefault((band, bucket), []).append(sid)
+        seen, out = set(), []
+        for ids in by_bucket.values():
+            if len(ids) < 2:
+                continue
+            ids = sorted(ids)
+            for i, a in enumerate(ids):
+                for b in ids[i + 1:]:
+                    if (a, b) in seen:
+                        continue
+                    seen.add((a, b))
+                    sim = similarity(self._load_sig(a), self._load_sig(b))
+                    if sim >= self.threshold:
+                        out.append((a, b, sim))
+        return sorted(out, key=lambda x: (-x[2], x[0], x[1]))
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="MinHash/LSH near-duplicate detection for skills/")
+    # Shared by the subcommands so the option goes after them, as in `dedup.py scan --threshold 0.9`
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "--threshold", type=threshold_arg, default=DEFAULT_THRESHOLD,
+        help=f"estimated Jaccard similarity ({MIN_THRESHOLD}-1; recall drops close to {MIN_THRESHOLD})",
+    )
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("scan", parents=[common], help="list near-duplicate pairs in the corpus")
+    p_check = sub.add_parser("check", parents=[common], help="compare files against the corpus")
+    p_check.add_argument("files", nargs="+", type=Path)
+    args = ap.parse_args()
+
+    with Registry(skills_dir=SKILLS_DIR) as reg:
+        reg.sync()
+        index = DedupIndex(reg, threshold=args.threshold)
+        stats = index.refresh()
+        print(f"signatures: signed {stats['signed']}, removed {stats['removed']}, unchanged {stats['unchanged']}", file=sys.stderr)
+        found = 0
+        if args.cmd == "scan":
+            for a, b, sim in index.pairs():
+                print(f"{sim:.2f}  {a}  {b}")
+                found += 1
+        else:
+            for f in args.files:
+                path = f.resolve()
+                own = path.relative_to(SKILLS_DIR).with_suffix("").as_posix() if SKILLS_DIR in path.parents else None
+                matches = index.query(path.read_text(encoding="utf-8"), exclude={own} if own else set())
+                for sid, sim in matches:
+                    print(f"{f}: {sim:.2f}  {sid}")
+                found += len(matches)
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
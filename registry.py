@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Embedded SQLite store for the skill registry, synced incrementally from skills/.
+
+One row per .md file under skills/ (group indices included, flagged is_index) with skill_id, group,
+summary, sha256, size, file mtime and the time its content last changed (the file mtime when first
+seen, the sync time for later content changes). Sync only stats unchanged files; changed files are
+re-read and re-hashed. A full-text index (FTS5, when the sqlite build has it) covers skill_id,
+summary and body.
+
+Usage:
+    from registry import Registry
+
+    with Registry() as reg:
+        reg.sync()
+        reg.group_counts()                 # {"memory-system": 7, ...}
+        reg.changed_since(time.time() - 3600)
+        reg.search("vector search")
+
+CLI:
+    python3 registry.py [sync|groups|changed SECONDS|search QUERY]
+"""
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+SKILLS_DIR = ROOT / "skills"
+# Hidden so serve.py never exposes it; gitignored. Other skill trees get their own store inside the tree
+DB_PATH = ROOT / ".airskill.db"
+BASE_URL = "https://skill.ruska.cn/skills"
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS skills (
+    id         INTEGER PRIMARY KEY,
+    skill_id   TEXT NOT NULL UNIQUE,
+    grp        TEXT NOT NULL,
+    rel_path   TEXT NOT NULL,
+    is_index   INTEGER NOT NULL,
+    summary    TEXT NOT NULL,
+    sha256     TEXT NOT NULL,
+    size       INTEGER NOT NULL,
+    mtime_ns   INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS skills_grp ON skills (grp);
+CREATE INDEX IF NOT EXISTS skills_updated_at ON skills (updated_at);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def extract_summary(content: str) -> str:
+    lines = [line.strip() for line in content.splitlines()]
+    after_header = False
+    for line in lines:
+        if not line:
+            continue
+        if line.lower().startswith("system prompt"):
+            after_header = True
+            continue
+        if after_header:
+            return line.replace("|", " / ")
+    return ""
+
+
+def skill_url(rel_path: str) -> str:
+    return f"{BASE_URL}/{rel_path}"
+
+
+class Registry:
+    """
+    SQLite-backed view of skills/. Call sync() before querying to pick up file changes.
+
+    db_path defaults to DB_PATH for the repo's skills/ and to <skills_dir>/.airskill.db for any other tree.
+    A store remembers the tree it was synced from; opening it for a different skills_dir raises ValueError
+    (syncing would otherwise replace every row with the other tree's files).
+    """
+
+    def __init__(self, db_path: str | os.PathLike | None = None, skills_dir: str | os.PathLike = SKILLS_DIR):
+        self.skills_dir = Path(skills_dir).resolve()
+        if db_path is None:
+            db_path = DB_PATH if self.skills_dir == SKILLS_DIR.resolve() else self.skills_dir / DB_PATH.name
+        self.db_path = Path(db_path)
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_schema()
+        self._check_skills_dir()
+
+    def _init_schema(self) -> None:
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self.conn.executescript("DROP TABLE IF EXISTS skills; DROP TABLE IF EXISTS skills_fts;")
+        self.conn.executescript(SCHEMA)
+        # FTS rowid == skills.id, so rows are replaced and deleted by rowid instead of scanning skill_id
+        try:
+            self.conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS skills_fts USING fts5(skill_id UNINDEXED, summary, body)"
+            )
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            # sqlite built without FTS5: search() falls back to LIKE on summaries
+            self.has_fts = False
+        self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.conn.commit()
+
+    def _check_skills_dir(self) -> None:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'skills_dir'").fetchone()
+        if row is None:
+            with self.conn:
+                self.conn.execute("INSERT INTO meta (key, value) VALUES ('skills_dir', ?)", (str(self.skills_dir),))
+        elif row[0] != str(self.skills_dir):
+            self.conn.close()
+            raise ValueError(f"{self.db_path} is the registry of {row[0]}, not {self.skills_dir}")
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "Registry":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # --- sync ---
+
+    def _scan(self) -> dict[str, tuple[Path, os.stat_result]]:
+        """rel_path -> (path, stat) for every .md under skills_dir. Stats only, no reads."""
+        found = {}
+        base = str(self.skills_dir)
+        for dirpath, dirnames, filenames in os.walk(base):
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+            for name in filenames:
+                if not name.endswith(".md"):
+                    continue
+                path = Path(dirpath, name)
+                try:
+                    st = path.stat()
+                except FileNotFoundError:
+                    # Removed between listing and stat; the next sync sees the final state
+                    continue
+                found[path.relative_to(self.skills_dir).as_posix()] = (path, st)
+        return found
+
+    def sync(self) -> dict:
+        """Bring the store in line with skills/. Return counts: added, updated, removed, unchanged."""
+        stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        known = {
+            row["rel_path"]: row
+            for row in self.conn.execute("SELECT id, skill_id, rel_path, sha256, size, mtime_ns FROM skills")
+        }
+        found = self._scan()
+        now = time.time()
+        with self.conn:
+            for rel, row in known.items():
+                if rel not in found:
+                    self.conn.execute("DELETE FROM skills WHERE id = ?", (row["id"],))
+                    if self.has_fts:
+                        self.conn.execute("DELETE FROM skills_fts WHERE rowid = ?", (row["id"],))
+                    stats["removed"] += 1
+            for rel, (path, st) in found.items():
+                row = known.get(rel)
+                if row is not None and row["mtime_ns"] == st.st_mtime_ns and row["size"] == st.st_size:
+                    stats["unchanged"] += 1
+                    continue
+                data = path.read_bytes()
+                digest = hashlib.sha256(data).hexdigest()
+                if row is not None and row["sha256"] == digest:
+                    # Touched but identical: refresh stat only, keep updated_at
+                    self.conn.execute(
+                        "UPDATE skills SET mtime_ns = ?, size = ? WHERE skill_id = ?",
+                        (st.st_mtime_ns, st.st_size, row["skill_id"]),
+                    )
+                    stats["unchanged"] += 1
+                    continue
+                # A file seen for the first time keeps its own mtime, so a fresh store does not report everything as just changed
+                self._upsert(rel, data, digest, st, now if row is not None else st.st_mtime, row)
+                stats["updated" if row is not None else "added"] += 1
+        return stats
+
+    def _upsert(
+        self, rel: str, data: bytes, digest: str, st: os.stat_result, updated_at: float, row: sqlite3.Row | None
+    ) -> None:
+        """Insert or replace the row for rel; row is its current (id, ...) row, or None for a new file."""
+        parts = rel.split("/")
+        skill_id = rel[: -len(".md")]
+        group = parts[0] if len(parts) > 1 else ""
+        text = data.decode("utf-8", errors="replace")
+        summary = extract_summary(text)
+        cur = self.conn.execute(
+            """INSERT INTO skills (skill_id, grp, rel_path, is_index, summary, sha256, size, mtime_ns, updated_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT(skill_id) DO UPDATE SET
+                 grp = excluded.grp, rel_path = excluded.rel_path, is_index = excluded.is_index,
+                 summary = excluded.summary, sha256 = excluded.sha256, size = excluded.size,
+                 mtime_ns = excluded.mtime_ns, updated_at = excluded.updated_at""",
+            (skill_id, group, rel, int(parts[-1] == "index.md"), summary, digest, st.st_size, st.st_mtime_ns, updated_at),
+        )
+        if self.has_fts:
+            if row is None:
+                rowid = cur.lastrowid
+            else:
+                rowid = row["id"]
+                self.conn.execute("DELETE FROM skills_fts WHERE rowid = ?", (rowid,))
+            self.conn.execute(
+                "INSERT INTO skills_fts (rowid, skill_id, summary, body) VALUES (?, ?, ?, ?)",
+                (rowid, skill_id, summary, text),
+            )
+
+    # --- queries ---
+
+    def skills(self, group: str | None = None, include_index: bool = False) -> list[sqlite3.Row]:
+        """Rows ordered by rel_path. group='' selects root-level skills; None selects all."""
+        sql = "SELECT * FROM skills WHERE (? OR is_index = 0)"
+        params: list = [int(include_index)]
+        if group is not None:
+            sql += " AND grp = ?"
+            params.append(group)
+        return self.conn.execute(sql + " ORDER BY rel_path", params).fetchall()
+
+    def get(self, skill_id: str) -> sqlite3.Row | None:
+        return self.conn.execute("SELECT * FROM skills WHERE skill_id = ?", (skill_id,)).fetchone()
+
+    def groups(self) -> list[str]:
+        """Group names (subdirectories of skills/ that contain at least one .md)."""
+        return [r[0] for r in self.conn.execute("SELECT DISTINCT grp FROM skills WHERE grp != '' ORDER BY grp")]
+
+    def group_counts(self) -> dict[str, int]:
+        """Group -> number of skills (group index.md not counted)."""
+        return {
+            r[0]: r[1]
+            for r in self.conn.execute(
+                "SELECT grp, COUNT(*) FROM skills WHERE grp != '' AND is_index = 0 GROUP BY grp ORDER BY grp"
+            )
+        }
+
+    def changed_since(self, ts: float) -> list[sqlite3.Row]:
+        """Skills whose content was added or changed after ts (unix time), oldest first."""
+        return self.conn.execute(
+            "SELECT * FROM skills WHERE updated_at > ? AND is_index = 0 ORDER BY updated_at, rel_path", (ts,)
+        ).fetchall()
+
+    def search(self, query: str, limit: int = 20, match_any: bool = False) -> list[sqlite3.Row]:
+        """Full-text search over skill_id, summary and body; best matches first. match_any: OR the terms instead of AND."""
+        if self.has_fts:
+            # Quote every term so user input is never parsed as FTS syntax
+            terms = (" OR " if match_any else " ").join('"' + t.replace('"', '""') + '"' for t in query.split())
+            if not terms:
+                return []
+            return self.conn.execute(
+                """SELECT s.* FROM skills_fts f JOIN skills s ON s.id = f.rowid
+                   WHERE skills_fts MATCH ? AND s.is_index = 0 ORDER BY f.rank LIMIT ?""",
+                (terms, limit),
+            ).fetchall()
+        return self.conn.execute(
+            "SELECT * FROM skills WHERE is_index = 0 AND (summary LIKE ? OR skill_id LIKE ?) ORDER BY rel_path LIMIT ?",
+            (f"%{query}%", f"%{query}%", limit),
+        ).fetchall()
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Sync and query the SQLite skill registry")
+    ap.add_argument("--db", type=Path, default=DB_PATH, help=f"database path (default {DB_PATH.name})")
+    sub = ap.add_subparsers(dest="cmd")
+    sub.add_parser("sync", help="sync from skills/ and print counts")
+    sub.add_parser("groups", help="skills per group")
+    p_changed = sub.add_parser("changed", help="skills changed in the last N seconds")
+    p_changed.add_argument("seconds", type=float)
+    p_search = sub.add_parser("search", help="full-text search")
+    p_search.add_argument("query")
+    p_search.add_argument("--limit", type=int, default=20)
+    args = ap.parse_args()
+
+    with Registry(args.db) as reg:
+        stats = reg.sync()
+        if args.cmd in (None, "sync"):
+            print(f"synced: added {stats['added']}, updated {stats['updated']}, removed {stats['removed']}, unchanged {stats['unchanged']}")
+        elif args.cmd == "groups":
+            print(f"(root): {len(reg.skills(group=''))}")
+            for group, n in reg.group_counts().items():
+                print(f"{group}: {n}")
+        elif args.cmd == "changed":
+            for row in reg.changed_since(time.time() - args.seconds):
+                print(f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(row['updated_at']))}  {row['skill_id']}")
+        elif args.cmd == "search":
+            for row in reg.search(args.query, args.limit):
+                print(f"{row['skill_id']} | {skill_url(row['rel_path'])} | {row['summary'][:120]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
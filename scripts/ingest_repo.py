@@ -17,6 +17,12 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parent.parent
 SKILLS_DIR = ROOT / "skills"
 BUILD_PY = ROOT / "build.py"
+sys.path.insert(0, str(ROOT))
+
+from dedup import (  # noqa: E402
+    DEFAULT_THRESHOLD, MIN_THRESHOLD, DedupIndex, merge_skill_text, similarity, text_signature, threshold_arg,
+)
+from registry import Registry  # noqa: E402
 
 # Load .env from project root
 _env = ROOT / ".env"
@@ -213,6 +219,14 @@ def main() -> None:
     ap = argparse.ArgumentParser(description="从本地仓库抽象 3-5 个 skill 并加入 AirSkill 索引")
     ap.add_argument("repo_path", type=Path, help="本地仓库目录路径")
     ap.add_argument("--group", "-g", default=None, help="技能组名（默认用仓库文件夹名）")
+    ap.add_argument(
+        "--on-duplicate", choices=("skip", "merge", "flag"), default="skip",
+        help="与已有技能近似重复时：skip 不写入（默认）；merge 把新内容中没有的行并入已有技能；flag 仍写入并提示",
+    )
+    ap.add_argument(
+        "--dup-threshold", type=threshold_arg, default=DEFAULT_THRESHOLD,
+        help=f"近似重复阈值（估计 Jaccard 相似度，{MIN_THRESHOLD}–1；LSH 分桶找不到更低相似度的对）",
+    )
     args = ap.parse_args()
 
     repo_path = args.repo_path.resolve()
@@ -246,13 +260,44 @@ def main() -> None:
     print(f"解析到 {len(skills)} 个技能: {[s[0] for s in skills]}")
     out_dir = SKILLS_DIR / group
     out_dir.mkdir(parents=True, exist_ok=True)
-    for slug, content in skills:
-        (out_dir / f"{slug}.md").write_text(content, encoding="utf-8")
-        print(f"  写入 {out_dir / f'{slug}.md'}")
+    # 从注册表查询该组已有技能，无需重新扫描目录；近似重复用 MinHash/LSH 对照全部已有技能
+    with Registry(skills_dir=SKILLS_DIR) as reg:
+        reg.sync()
+        existing = {rec["skill_id"] for rec in reg.skills(group=group)}
+        index = DedupIndex(reg, threshold=args.dup_threshold)
+        index.refresh()
+        accepted = []  # 本批已写入的 (skill_id, signature)，批内也要去重
+        for slug, content in skills:
+            skill_id = f"{group}/{slug}"
+            sig = text_signature(content)
+            dups = index.query_signature(sig, exclude={skill_id})
+            dups += [(sid, sim) for sid, s in accepted if (sim := similarity(sig, s)) >= args.dup_threshold]
+            dups.sort(key=lambda x: -x[1])
+            path = out_dir / f"{slug}.md"
+            if dups:
+                best, sim = dups[0]
+                print(f"  近似重复: {skill_id} ≈ {best}（相似度 {sim:.2f}）")
+                if args.on_duplicate == "skip":
+                    print(f"  跳过 {path}")
+                    continue
+                if args.on_duplicate == "merge":
+                    target = SKILLS_DIR / f"{best}.md"
+                    target.write_text(merge_skill_text(target.read_text(encoding="utf-8"), content), encoding="utf-8")
+                    print(f"  合并到 {target}")
+                    continue
+            action = "覆盖" if skill_id in existing else "写入"
+            path.write_text(content, encoding="utf-8")
+            accepted.append((skill_id, sig))
+            print(f"  {action} {path}")
+    if not any(out_dir.iterdir()):
+        out_dir.rmdir()
 
     print("正在运行 build.py 更新索引...")
     subprocess.run([sys.executable, str(BUILD_PY)], check=True, cwd=str(ROOT))
-    print("完成。新技能组:", group, "->", f"https://skill.ruska.cn/skills/{group}/index.md")
+    with Registry(skills_dir=SKILLS_DIR) as reg:
+        reg.sync()
+        count = reg.group_counts().get(group, 0)
+    print("完成。新技能组:", group, f"（共 {count} 个技能）", "->", f"https://skill.ruska.cn/skills/{group}/index.md")
 
 
 if __name__ == "__main__":
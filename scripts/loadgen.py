@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+负载生成器：按真实代理的导航路径（首页 Manifest → 组 index.md → 子技能 .md）回放请求，
+报告吞吐（req/s）与延迟分位数（p50/p90/p99）。配合 scripts/serve.py 在本地测量。
+
+每个 worker 是一个「代理」：持有一条 keep-alive 连接，随机选一行技能/分组走完整导航路径。
+--revalidate 模拟带缓存的代理：对已拉取过的 URL 发送 If-None-Match，期望得到 304。
+
+用法:
+  python3 scripts/loadgen.py [--url http://127.0.0.1:8000] [--concurrency 8] [--duration 10]
+"""
+
+import argparse
+import http.client
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from urllib.parse import urlsplit
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from airskill_client import CANONICAL_BASE, extract_manifest, parse_index_rows  # noqa: E402
+
+
+def _path_of(link: str) -> str:
+    if link.startswith(CANONICAL_BASE):
+        link = link[len(CANONICAL_BASE):]
+    return urlsplit(link).path or "/"
+
+
+def _get(conn: http.client.HTTPConnection, path: str, headers: dict) -> tuple[int, dict, bytes]:
+    conn.request("GET", path, headers=headers)
+    resp = conn.getresponse()
+    body = resp.read()
+    return resp.status, {k.lower(): v for k, v in resp.getheaders()}, body
+
+
+def discover_paths(host: str, port: int) -> list[list[str]]:
+    """从服务器读取 Manifest 与各组 index.md，得到所有导航路径（每条是依次请求的路径列表）。"""
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    try:
+        status, _h, body = _get(conn, "/", {})
+        if status != 200:
+            raise SystemExit(f"GET / -> HTTP {status}")
+        navs = []
+        for _sid, link, _summary in parse_index_rows(extract_manifest(body.decode("utf-8"))):
+            path = _path_of(link)
+            if not path.endswith("/index.md"):
+                navs.append(["/", path])
+                continue
+            status, _h, group_body = _get(conn, path, {})
+            if status != 200:
+                continue
+            for _sub, sub_link, _s in parse_index_rows(group_body.decode("utf-8")):
+                navs.append(["/", path, _path_of(sub_link)])
+        return navs
+    finally:
+        conn.close()
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+def run(
+    host: str,
+    port: int,
+    navs: list[list[str]],
+    concurrency: int,
+    duration: float,
+    revalidate: bool,
+    gzip: bool,
+    seed: int,
+) -> dict:
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    total_bytes = 0
+    errors = 0
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def agent(idx: int) -> None:
+        nonlocal total_bytes, errors
+        rng = random.Random(seed + idx)
+        conn = http.client.HTTPConnection(host, port, timeout=10)
+        etags: dict[str, str] = {}
+        local_lat, local_status, local_bytes, local_err = [], Counter(), 0, 0
+        while time.perf_counter() < deadline:
+            for path in rng.choice(navs):
+                headers = {"User-Agent": "airskill-loadgen/1"}
+                if gzip:
+                    headers["Accept-Encoding"] = "gzip"
+                if revalidate and path in etags:
+                    headers["If-None-Match"] = etags[path]
+                t0 = time.perf_counter()
+                try:
+                    status, resp_headers, body = _get(conn, path, headers)
+                except (OSError, http.client.HTTPException):
+                    local_err += 1
+                    conn.close()
+                    conn = http.client.HTTPConnection(host, port, timeout=10)
+                    break
+                local_lat.append(time.perf_counter() - t0)
+                local_status[status] += 1
+                local_bytes += len(body)
+                if resp_headers.get("etag"):
+                    etags[path] = resp_headers["etag"]
+        conn.close()
+        with lock:
+            latencies.extend(local_lat)
+            statuses.update(local_status)
+            total_bytes += local_bytes
+            errors += local_err
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=agent, args=(i,)) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "elapsed": elapsed,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "bytes": total_bytes,
+        "errors": errors,
+        "statuses": dict(sorted(statuses.items())),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p90_ms": percentile(latencies, 90) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": (latencies[-1] * 1000) if latencies else 0.0,
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="按代理导航路径回放请求，报告 req/s 与延迟分位数")
+    ap.add_argument("--url", default="http://127.0.0.1:8000", help="服务器地址（默认 scripts/serve.py 的地址）")
+    ap.add_argument("--concurrency", "-c", type=int, default=8, help="并发代理数")
+    ap.add_argument("--duration", "-d", type=float, default=10.0, help="持续秒数")
+    ap.add_argument("--revalidate", action="store_true", help="对已拉取的 URL 发送 If-None-Match（模拟带缓存的代理）")
+    ap.add_argument("--gzip", action="store_true", help="发送 Accept-Encoding: gzip")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    parts = urlsplit(args.url)
+    if parts.scheme != "http":
+        raise SystemExit("只支持 http://（本地压测）")
+    host, port = parts.hostname or "127.0.0.1", parts.port or 80
+
+    navs = discover_paths(host, port)
+    if not navs:
+        raise SystemExit("Manifest 中没有可导航的技能")
+    print(f"导航路径: {len(navs)} 条；并发 {args.concurrency}，持续 {args.duration:g}s")
+
+    r = run(host, port, navs, args.concurrency, args.duration, args.revalidate, args.gzip, args.seed)
+    print(f"requests: {r['requests']}  errors: {r['errors']}  statuses: {r['statuses']}")
+    print(f"throughput: {r['rps']:.1f} req/s  ({r['bytes'] / max(r['elapsed'], 1e-9) / 1024:.1f} KiB/s)")
+    print(
+        f"latency ms: p50 {r['p50_ms']:.2f}  p90 {r['p90_ms']:.2f}  "
+        f"p99 {r['p99_ms']:.2f}  max {r['max_ms']:.2f}"
+    )
+    return 1 if r["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+本地静态服务器：在本机模拟线上站点，用于测量代理端拉取延迟与缓存行为（配合 scripts/loadgen.py）。
+
+- `/` 返回 index.html，其余路径映射到根目录下的文件（skills/**、生成产物等）；隐藏文件（如 .env）不对外提供。
+  以仓库根目录为站点根（默认）时只提供 index.html、CNAME、manifest.json、skills/、h/，源码文件返回 404。
+- 强 ETag（内容 sha256），命中 If-None-Match 返回 304；同时支持 If-Modified-Since。
+- gzip：优先使用同目录预压缩的 `<file>.gz`，否则即时压缩并缓存在内存。
+- HTTP/1.1 keep-alive，多线程。
+
+用法:
+  python3 scripts/serve.py [--port 8000] [--root DIR]
+"""
+
+import argparse
+import gzip
+import hashlib
+import mimetypes
+import threading
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+ROOT = Path(__file__).resolve().parent.parent
+# 以仓库根目录为站点根时只对外提供站点产物，源码（build.py、requests.jsonl 等）一律 404
+PUBLIC_FILES = {"index.html", "CNAME", "manifest.json"}
+PUBLIC_DIRS = {"skills", "h"}
+
+# gzip 对很小的文件没有收益
+MIN_GZIP_SIZE = 256
+TEXT_TYPES = {
+    ".md": "text/markdown; charset=utf-8",
+    ".html": "text/html; charset=utf-8",
+    ".txt": "text/plain; charset=utf-8",
+    ".json": "application/json",
+    "": "text/plain; charset=utf-8",
+}
+
+
+class _FileCache:
+    """(path) -> 内容、ETag、gzip 变体；按 mtime/size 失效。"""
+
+    def __init__(self):
+        self._entries: dict[Path, dict] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: Path) -> dict:
+        st = path.stat()
+        key = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is not None and entry["key"] == key:
+            return entry
+        body = path.read_bytes()
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        entry = {
+            "key": key,
+            "body": body,
+            "etag": f'"{digest}"',
+            "gz": None,
+            "last_modified": formatdate(st.st_mtime, usegmt=True),
+            "mtime": int(st.st_mtime),
+        }
+        with self._lock:
+            self._entries[path] = entry
+        return entry
+
+    def gzipped(self, path: Path, entry: dict) -> bytes:
+        if entry["gz"] is None:
+            pre = path.with_name(path.name + ".gz")
+            if pre.is_file() and pre.stat().st_mtime_ns >= entry["key"][0]:
+                entry["gz"] = pre.read_bytes()
+            else:
+                entry["gz"] = gzip.compress(entry["body"], compresslevel=6, mtime=0)
+        return entry["gz"]
+
+
+def content_type(path: Path) -> str:
+    if path.suffix in TEXT_TYPES:
+        return TEXT_TYPES[path.suffix]
+    return mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+
+
+def cache_control(rel: str) -> str:
+    """内容寻址路径（build.py --dist 生成的 h/<hash>/...）永久缓存；其余路径可变，客户端需重新验证。"""
+    if rel.startswith("h/"):
+        return "public, max-age=31536000, immutable"
+    return "no-cache"
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # If-None-Match 使用弱比较：忽略 W/ 前缀
+    candidates = [t.strip().removeprefix("W/") for t in header.split(",")]
+    return etag in candidates
+
+
+def is_public(rel: str) -> bool:
+    parts = Path(rel).parts
+    if len(parts) == 1:
+        return parts[0] in PUBLIC_FILES
+    return bool(parts) and parts[0] in PUBLIC_DIRS
+
+
+def make_handler(root: Path, cache: _FileCache, public_only: bool = False):
+    root = root.resolve()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        server_version = "AirSkillDev/1"
+
+        def log_message(self, format, *args):
+            if self.server.verbose:
+                super().log_message(format, *args)
+
+        def _resolve(self) -> tuple[Path, str] | None:
+            rel = unquote(urlsplit(self.path).path).lstrip("/")
+            if rel == "" or rel.endswith("/"):
+                rel += "index.html" if rel == "" else "index.md"
+            parts = Path(rel).parts
+            if any(p.startswith(".") or p == ".." for p in parts):
+                return None
+            if public_only and not is_public(rel):
+                return None
+            path = (root / rel).resolve()
+            if root not in path.parents or not path.is_file():
+                return None
+            return path, rel
+
+        def _send_error(self, code: int, message: str) -> None:
+            body = (message + "\n").encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(body)
+
+        def _serve(self) -> None:
+            resolved = self._resolve()
+            if resolved is None:
+                self._send_error(404, "Not Found")
+                return
+            path, rel = resolved
+            try:
+                entry = cache.get(path)
+            except OSError:
+                self._send_error(404, "Not Found")
+                return
+
+            use_gzip = (
+                "gzip" in self.headers.get("Accept-Encoding", "")
+                and len(entry["body"]) >= MIN_GZIP_SIZE
+            )
+            # 强 ETag 必须区分不同编码的表示
+            etag = entry["etag"][:-1] + '-gz"' if use_gzip else entry["etag"]
+
+            not_modified = False
+            inm = self.headers.get("If-None-Match")
+            if inm is not None:
+                not_modified = etag_matches(inm, etag) or etag_matches(inm, entry["etag"])
+            elif self.headers.get("If-Modified-Since"):
+                try:
+                    since = parsedate_to_datetime(self.headers["If-Modified-Since"])
+                    not_modified = entry["mtime"] <= int(since.timestamp())
+                except (TypeError, ValueError):
+                    pass
+
+            self.send_response(304 if not_modified else 200)
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", entry["last_modified"])
+            self.send_header("Cache-Control", cache_control(rel))
+            self.send_header("Vary", "Accept-Encoding")
+            if not_modified:
+                # 304 没有消息体，不发送 Content-Length
+                self.end_headers()
+                return
+            body = cache.gzipped(path, entry) if use_gzip else entry["body"]
+            self.send_header("Content-Type", content_type(path))
+            if use_gzip:
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(body)
+
+        def do_GET(self):
+            self._serve()
+
+        def do_HEAD(self):
+            self._serve()
+
+    return Handler
+
+
+def make_server(host: str, port: int, root: Path, verbose: bool = False, public_only: bool = False) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), make_handler(root, _FileCache(), public_only))
+    server.daemon_threads = True
+    server.verbose = verbose
+    return server
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="AirSkill 本地静态服务器（ETag / 304 / gzip / keep-alive）")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", "-p", type=int, default=8000)
+    ap.add_argument("--root", type=Path, default=ROOT, help="站点根目录（默认仓库根目录，此时只提供 index.html、CNAME、manifest.json、skills/、h/）")
+    ap.add_argument("--verbose", "-v", action="store_true", help="打印每个请求")
+    args = ap.parse_args()
+
+    root = args.root.resolve()
+    if not (root / "index.html").is_file():
+        raise SystemExit(f"{root} 下没有 index.html，请先运行 build.py")
+    server = make_server(args.host, args.port, root, args.verbose, public_only=root == ROOT)
+    print(f"Serving {root} at http://{args.host}:{args.port}/ (Ctrl+C 退出)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+注册表完整性校验：并发扫描 skills/ 与索引，一次遍历完成以下检查，输出机器可读的结果，可作为发布前的门禁。
+
+- broken-link：主索引或组 index.md 中的 Direct Link 指向不存在的文件
+- foreign-link：Direct Link 不在 https://skill.ruska.cn/skills/ 下
+- unlisted：技能文件未出现在任何索引中
+- stale-index：组目录下只剩 index.md（组已删除但索引残留）
+- missing-index：组目录有技能但没有 index.md
+- empty-summary：技能 `System Prompt:` 下没有正文（Summary 为空）
+- duplicate-summary：多个技能的 Summary 相同
+- broken-row：索引表格行的列数不对（Summary 中的 `|` 或换行破坏了表格）
+- pipe-in-summary（warning）：技能 Summary 含 `|`，构建时会被替换为 ` / `
+
+用法:
+  python3 scripts/validate_registry.py [--root DIR] [--format text|json|jsonl] [--jobs N]
+退出码：有 error 级别问题时为 1。
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BASE_URL = "https://skill.ruska.cn/skills/"
+URL_RE = re.compile(r"https?://[^\s|)]+")
+# 每个任务处理的文件数；小文件 I/O 为主，线程足够
+CHUNK = 256
+
+
+def read_summary(text: str) -> str:
+    """`System Prompt:` 之后第一行非空正文（未做 `|` 替换，便于检查）。"""
+    after_header = False
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if line.lower().startswith("system prompt"):
+            after_header = True
+            continue
+        if after_header:
+            return line
+    return ""
+
+
+def table_rows(text: str) -> list[tuple[int, str, list[str]]]:
+    """索引中的表格行：(行号, 原始行, 单元格)。跳过表头与分隔行。"""
+    rows = []
+    for lineno, raw in enumerate(text.splitlines(), 1):
+        line = raw.strip()
+        if not line.startswith("|") or line.startswith("| :---") or line.startswith("| Skill ID"):
+            continue
+        inner = line[1:-1] if line.endswith("|") and len(line) > 1 else line[1:]
+        rows.append((lineno, line, [c.strip() for c in inner.split("|")]))
+    return rows
+
+
+def _scan_chunk(skills_dir: Path, rels: list[str]) -> list[dict]:
+    out = []
+    for rel in rels:
+        try:
+            text = (skills_dir / rel).read_text(encoding="utf-8", errors="replace")
+        except OSError as e:
+            out.append({"rel": rel, "error": str(e)})
+            continue
+        if rel.endswith("/index.md") or rel == "index.md":
+            out.append({"rel": rel, "index": text})
+        else:
+            out.append({"rel": rel, "summary": read_summary(text)})
+    return out
+
+
+def list_files(skills_dir: Path) -> list[str]:
+    files = []
+    for dirpath, dirnames, filenames in os.walk(skills_dir):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        for name in filenames:
+            if name.endswith(".md"):
+                files.append(Path(dirpath, name).relative_to(skills_dir).as_posix())
+    return sorted(files)
+
+
+def validate(root: Path, jobs: int = 8) -> list[dict]:
+    skills_dir = root / "skills"
+    index_html = root / "index.html"
+    findings: list[dict] = []
+
+    def add(check: str, message: str, path: str = "", severity: str = "error", **extra) -> None:
+        findings.append({"check": check, "severity": severity, "path": path, "message": message, **extra})
+
+    files = list_files(skills_dir)
+    file_set = set(files)
+    chunks = [files[i:i + CHUNK] for i in range(0, len(files), CHUNK)]
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as ex:
+        results = [r for chunk in ex.map(lambda c: _scan_chunk(skills_dir, c), chunks) for r in chunk]
+
+    # --- 组目录：残留 / 缺失的 index.md ---
+    group_files: dict[str, list[str]] = {}
+    for rel in files:
+        if "/" in rel:
+            group_files.setdefault(rel.split("/", 1)[0], []).append(rel)
+    for group, rels in sorted(group_files.items()):
+        has_index = f"{group}/index.md" in file_set
+        skills_in_group = [r for r in rels if not r.endswith("/index.md")]
+        if has_index and not skills_in_group:
+            add("stale-index", f"group '{group}' has no skills left but index.md remains", f"skills/{group}/index.md")
+        elif skills_in_group and not has_index:
+            add("missing-index", f"group '{group}' has {len(skills_in_group)} skill(s) but no index.md", f"skills/{group}/")
+
+    # --- Summary：空、重复、含 `|` ---
+    by_summary: dict[str, list[str]] = {}
+    indices: list[tuple[str, str]] = []
+    for r in results:
+        rel = r["rel"]
+        if "error" in r:
+            add("unreadable", r["error"], f"skills/{rel}")
+            continue
+        if "index" in r:
+            indices.append((f"skills/{rel}", r["index"]))
+            continue
+        skill_id = rel[: -len(".md")]
+        summary = r["summary"]
+        if not summary:
+            add("empty-summary", "no text after 'System Prompt:'", f"skills/{rel}", skill_id=skill_id)
+            continue
+        if "|" in summary:
+            add("pipe-in-summary", "summary contains '|' (build replaces it with ' / ')", f"skills/{rel}", "warning", skill_id=skill_id)
+        by_summary.setdefault(re.sub(r"\s+", " ", summary).strip().lower(), []).append(skill_id)
+    for ids in by_summary.values():
+        if len(ids) > 1:
+            for sid in ids:
+                others = [o for o in ids if o != sid]
+                add("duplicate-summary", f"same summary as {', '.join(others)}", f"skills/{sid}.md", skill_id=sid)
+
+    # --- 索引：表格行、链接 ---
+    if index_html.is_file():
+        indices.insert(0, ("index.html", index_html.read_text(encoding="utf-8")))
+    else:
+        add("missing-index", "root manifest not found", "index.html")
+    linked: set[str] = set()
+    for path, text in indices:
+        for lineno, line, cells in table_rows(text):
+            where = f"{path}:{lineno}"
+            if not line.endswith("|") or len(cells) != 3:
+                add("broken-row", f"expected 3 cells, got {len(cells)}: {line[:120]}", where)
+            for url in URL_RE.findall(line):
+                url = url.rstrip(".,;")
+                if not url.startswith(BASE_URL):
+                    add("foreign-link", f"Direct Link outside {BASE_URL}: {url}", where, "warning")
+                    continue
+                rel = url[len(BASE_URL):]
+                linked.add(rel)
+                if rel not in file_set:
+                    add("broken-link", f"Direct Link target does not exist: {url}", where)
+    for rel in files:
+        if rel not in linked:
+            add("unlisted", "not listed in index.html or any group index.md", f"skills/{rel}")
+
+    findings.sort(key=lambda f: (f["severity"] != "error", f["check"], f["path"]))
+    return findings
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="校验技能注册表：链接、Summary、残留索引、表格格式")
+    ap.add_argument("--root", type=Path, default=ROOT, help="站点根目录（含 index.html 与 skills/；也可指向 build.py --dist 的输出）")
+    ap.add_argument("--format", choices=("text", "json", "jsonl"), default="text")
+    ap.add_argument("--jobs", "-j", type=int, default=min(32, (os.cpu_count() or 1) * 4), help="并发读取线程数")
+    args = ap.parse_args()
+
+    root = args.root.resolve()
+    if not (root / "skills").is_dir():
+        raise SystemExit(f"{root} 下没有 skills/ 目录")
+    t0 = time.perf_counter()
+    findings = validate(root, args.jobs)
+    elapsed = time.perf_counter() - t0
+    errors = sum(1 for f in findings if f["severity"] == "error")
+
+    if args.format == "json":
+        print(json.dumps({"errors": errors, "warnings": len(findings) - errors, "elapsed": round(elapsed, 3), "findings": findings}, ensure_ascii=False, indent=2))
+    elif args.format == "jsonl":
+        for f in findings:
+            print(json.dumps(f, ensure_ascii=False))
+    else:
+        for f in findings:
+            print(f"{f['severity'].upper():7} {f['check']:18} {f['path']}  {f['message']}")
+        print(f"{errors} error(s), {len(findings) - errors} warning(s) in {elapsed:.2f}s", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,12 +7,20 @@ Flow:
 2. Give Gemini the root index content + group index content(s).
 3. Ask Gemini to list every Direct Link it would fetch to get all skills.
 4. Parse Gemini response and compare to expected.
+   --per-group: one prompt per index (root + each group) run concurrently, answers merged and cached by prompt hash;
+   --model stub runs the same pipeline offline with a local stand-in model.
+5. Simulate what reaching each skill (or each query's best match) costs an agent: requests, bytes, estimated tokens.
 """
 
+import argparse
 import csv
+import hashlib
+import math
 import os
 import re
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add project root for imports
@@ -28,22 +36,20 @@ if _env.is_file():
     except ImportError:
         pass
 
+from registry import Registry  # noqa: E402
+
 SKILLS_DIR = ROOT / "skills"
 INDEX_HTML = ROOT / "index.html"
+LLM_CACHE_DIR = ROOT / "tests" / "output" / ".llm_cache"
 BASE_URL = "https://skill.ruska.cn/skills"
 
 # build.py 里无 overview 时的通用 Summary；主索引出现此句说明组行无意义，AI 无法判断该组用途
 GENERIC_GROUP_SUMMARY = "Layered skill group. Fetch Direct Link for sub-skill index."
 
 
-def get_expected_urls() -> set[str]:
-    """All .md files under skills/ as full Direct Links."""
-    expected = set()
-    for path in sorted(SKILLS_DIR.rglob("*.md")):
-        rel = path.relative_to(SKILLS_DIR)
-        url = f"{BASE_URL}/{rel.as_posix()}"
-        expected.add(url)
-    return expected
+def get_expected_urls(records: list) -> set[str]:
+    """All .md files under skills/ as full Direct Links. records: registry rows, group index.md included."""
+    return {f"{BASE_URL}/{rec['rel_path']}" for rec in records}
 
 
 def get_index_text() -> str:
@@ -55,27 +61,53 @@ def get_index_text() -> str:
     return m.group(1).strip()
 
 
-def get_group_index_texts() -> list[tuple[str, str]]:
+def get_group_index_texts(records: list) -> list[tuple[str, str]]:
     """(group_name, content) for each skills/<group>/index.md."""
     out = []
-    for d in SKILLS_DIR.iterdir():
-        if not d.is_dir():
-            continue
-        idx = d / "index.md"
-        if idx.is_file():
-            out.append((d.name, idx.read_text(encoding="utf-8")))
+    for rec in records:
+        if rec["grp"] and rec["rel_path"] == f"{rec['grp']}/index.md":
+            out.append((rec["grp"], (SKILLS_DIR / rec["rel_path"]).read_text(encoding="utf-8")))
     return out
 
 
-def run_gemini(api_key: str, index_text: str, group_texts: list[tuple[str, str]]) -> str:
-    """Call Gemini to extract all Direct Links from root + group indices."""
-    try:
-        import google.generativeai as genai
-    except ImportError:
-        raise RuntimeError("Install: pip install google-generativeai")
+class GeminiModel:
+    """Gemini behind the generate(prompt) -> text interface used by the discovery checks."""
+
+    name = "gemini-2.0-flash"
+
+    def __init__(self, api_key: str):
+        try:
+            import google.generativeai as genai
+        except ImportError:
+            raise RuntimeError("Install: pip install google-generativeai")
+        genai.configure(api_key=api_key)
+        self._model = genai.GenerativeModel(self.name)
+
+    def generate(self, prompt: str) -> str:
+        response = self._model.generate_content(prompt)
+        if not response or not response.text:
+            raise RuntimeError("Empty response from Gemini")
+        return response.text
+
+
+class StubModel:
+    """Offline stand-in: answers with every Direct Link in the prompt's index tables, after an optional simulated latency."""
+
+    name = "stub"
 
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel("gemini-2.0-flash")
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    def generate(self, prompt: str) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        table = "\n".join(line for line in prompt.splitlines() if line.strip().startswith("|"))
+        return "\n".join(sorted(parse_urls_from_text(table)))
+
+
+def run_gemini(api_key: str, index_text: str, group_texts: list[tuple[str, str]], model=None) -> str:
+    """Call Gemini (or the given model) to extract all Direct Links from root + group indices in one prompt."""
+    model = model or GeminiModel(api_key)
 
     prompt_parts = [
         "You are an AI agent using the AirSkill manifest. Your task: list every Direct Link (URL) that points to an .md file so that you could fetch all skills.",
@@ -94,10 +126,78 @@ def run_gemini(api_key: str, index_text: str, group_texts: list[tuple[str, str]]
     prompt_parts.append("--- END ---")
     prompt_parts.append("Output every skill Direct Link (one per line):")
 
-    response = model.generate_content("\n".join(prompt_parts))
-    if not response or not response.text:
-        raise RuntimeError("Empty response from Gemini")
-    return response.text
+    return model.generate("\n".join(prompt_parts))
+
+
+def cached_generate(model, prompt: str, use_cache: bool = True) -> tuple[str, bool]:
+    """model.generate(prompt), cached on disk by hash of model name + prompt (which embeds the index content). Returns (text, cache_hit)."""
+    key = hashlib.sha256(f"{model.name}\n{prompt}".encode("utf-8")).hexdigest()
+    path = LLM_CACHE_DIR / f"{key}.txt"
+    if use_cache and path.is_file():
+        return path.read_text(encoding="utf-8"), True
+    text = model.generate(prompt)
+    if use_cache:
+        LLM_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, path)
+    return text, False
+
+
+def run_discovery_per_group(
+    model,
+    index_text: str,
+    group_texts: list[tuple[str, str]],
+    jobs: int = 4,
+    use_cache: bool = True,
+) -> tuple[set[str], dict]:
+    """
+    One prompt for the root manifest plus one per group index, run with at most `jobs` in flight; the URL sets are merged.
+    Keeps each prompt small regardless of how many groups exist. Returns (urls, info) where info has timings and cache hits.
+    """
+    rules = "Output only URLs, one per line. No other text."
+    tasks = [(
+        "(root)",
+        "\n".join([
+            "You are an AI agent using the AirSkill manifest. List every Direct Link (URL) in the table below (Skill ID, Direct Link, Summary), including rows that point to a group index.md.",
+            rules, "", "--- ROOT MANIFEST ---", index_text, "--- END ---", "Output every Direct Link (one per line):",
+        ]),
+    )]
+    for group_name, content in group_texts:
+        tasks.append((
+            group_name,
+            "\n".join([
+                f"You are an AI agent inside the **{group_name}** skill group of the AirSkill manifest. List every Direct Link (URL) in the Sub-skills table below.",
+                rules, "", f"--- GROUP INDEX: {group_name} (content of .../skills/{group_name}/index.md) ---", content, "--- END ---",
+                "Output every sub-skill Direct Link (one per line):",
+            ]),
+        ))
+
+    def one(task: tuple[str, str]) -> tuple[str, set[str], float, bool]:
+        name, prompt = task
+        t0 = time.perf_counter()
+        text, hit = cached_generate(model, prompt, use_cache)
+        return name, parse_urls_from_response(text), time.perf_counter() - t0, hit
+
+    started = time.perf_counter()
+    found: set[str] = set()
+    per_task = {}
+    hits = 0
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as ex:
+        for name, urls, elapsed, hit in ex.map(one, tasks):
+            found |= urls
+            per_task[name] = elapsed
+            hits += hit
+    info = {
+        "model": model.name,
+        "mode": "per-group",
+        "prompts": len(tasks),
+        "jobs": jobs,
+        "cache_hits": hits,
+        "elapsed": time.perf_counter() - started,
+        "per_task": per_task,
+    }
+    return found, info
 
 
 def parse_urls_from_response(text: str) -> set[str]:
@@ -122,17 +222,11 @@ def parse_index_programmatically(index_text: str, group_texts: list[tuple[str, s
     return {u.rstrip(".,;)") for u in found}
 
 
-def get_expected_urls_by_group() -> dict[str, set[str]]:
+def get_expected_urls_by_group(records: list) -> dict[str, set[str]]:
     """Expected URLs per group (group name -> set of full URLs). Root-level skills in group ''."""
     by_group = {}
-    for path in sorted(SKILLS_DIR.rglob("*.md")):
-        rel = path.relative_to(SKILLS_DIR)
-        url = f"{BASE_URL}/{rel.as_posix()}"
-        parts = rel.parts
-        group = "" if len(parts) == 1 else parts[0]
-        if group not in by_group:
-            by_group[group] = set()
-        by_group[group].add(url)
+    for rec in records:
+        by_group.setdefault(rec["grp"], set()).add(f"{BASE_URL}/{rec['rel_path']}")
     return by_group
 
 
@@ -209,6 +303,7 @@ def build_skill_assessment(
         info = url_to_info.get(url)
         if not info:
             result.append({
+                "url": url,
                 "skill": skill_id_from_url,
                 "description": "(未在索引中)",
                 "ai_understandable": "不能",
@@ -223,6 +318,7 @@ def build_skill_assessment(
 
         if not in_manifest:
             result.append({
+                "url": url,
                 "skill": sid,
                 "description": summary[:200] + ("…" if len(summary) > 200 else ""),
                 "ai_understandable": "不能",
@@ -231,6 +327,7 @@ def build_skill_assessment(
             })
         elif is_generic:
             result.append({
+                "url": url,
                 "skill": sid,
                 "description": summary[:200] + ("…" if len(summary) > 200 else ""),
                 "ai_understandable": "不能",
@@ -246,6 +343,7 @@ def build_skill_assessment(
             # 描述有效性: 5=具体可区分、可选型, 4=清晰, 3=一般
             score = 5 if len(summary) > 80 else 4
             result.append({
+                "url": url,
                 "skill": sid,
                 "description": desc_short,
                 "ai_understandable": "能",
@@ -255,6 +353,80 @@ def build_skill_assessment(
     return result
 
 
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate: ~4 ASCII chars per token, ~1 token per non-ASCII (e.g. CJK) char."""
+    ascii_chars = sum(1 for c in text if ord(c) < 128)
+    return math.ceil(ascii_chars / 4) + (len(text) - ascii_chars)
+
+
+def simulate_navigation_cost(expected: set[str]) -> dict[str, dict]:
+    """
+    Cost for an agent to reach each expected URL through the indices: root manifest (index.html as served)
+    -> group index.md (for grouped skills) -> the skill itself. Returns url -> {requests, index_bytes, bytes, tokens}.
+    """
+    def fetched(url: str) -> str:
+        path = SKILLS_DIR / url.replace(BASE_URL + "/", "")
+        return path.read_text(encoding="utf-8") if path.is_file() else ""
+
+    root = INDEX_HTML.read_text(encoding="utf-8")
+    costs = {}
+    for url in sorted(expected):
+        rel = url.replace(BASE_URL + "/", "")
+        steps = [root]
+        if "/" in rel and not rel.endswith("/index.md"):
+            steps.append(fetched(f"{BASE_URL}/{rel.split('/', 1)[0]}/index.md"))
+        target = fetched(url)
+        index_bytes = sum(len(t.encode("utf-8")) for t in steps)
+        steps.append(target)
+        costs[url] = {
+            "requests": len(steps),
+            "index_bytes": index_bytes,
+            "bytes": index_bytes + len(target.encode("utf-8")),
+            "tokens": sum(estimate_tokens(t) for t in steps),
+        }
+    return costs
+
+
+def simulate_query_costs(reg: Registry, queries: list[str], costs: dict[str, dict]) -> list[dict]:
+    """For each query, pick the best full-text match from the (synced) registry and report the cost of reaching it."""
+    out = []
+    for q in queries:
+        hits = reg.search(q, limit=1, match_any=True)
+        if not hits:
+            out.append({"query": q, "skill": "", "requests": 0, "index_bytes": 0, "bytes": 0, "tokens": 0})
+            continue
+        url = f"{BASE_URL}/{hits[0]['rel_path']}"
+        out.append({"query": q, "skill": hits[0]["skill_id"], **costs.get(url, {})})
+    return out
+
+
+def cost_distribution(rows: list[dict], key: str) -> dict:
+    values = sorted(r[key] for r in rows if key in r)
+    if not values:
+        return {"min": 0, "p50": 0, "p90": 0, "max": 0, "mean": 0, "total": 0}
+
+    def pct(p: float) -> int:
+        return values[min(len(values) - 1, math.ceil(p / 100 * len(values)) - 1)]
+
+    return {
+        "min": values[0],
+        "p50": pct(50),
+        "p90": pct(90),
+        "max": values[-1],
+        "mean": round(sum(values) / len(values), 1),
+        "total": sum(values),
+    }
+
+
+def _cost_section(title: str, rows: list[dict]) -> list[str]:
+    lines = [f"### {title}", "", f"- **样本数**: {len(rows)}", "", "| 指标 | min | p50 | p90 | max | mean | total |", "| --- | --- | --- | --- | --- | --- | --- |"]
+    for key, label in (("requests", "请求数"), ("index_bytes", "索引字节"), ("bytes", "总字节"), ("tokens", "估计 tokens")):
+        d = cost_distribution(rows, key)
+        lines.append(f"| {label} | {d['min']} | {d['p50']} | {d['p90']} | {d['max']} | {d['mean']} | {d['total']} |")
+    lines.append("")
+    return lines
+
+
 def write_result_file(
     expected: set[str],
     parsed: set[str],
@@ -264,8 +436,11 @@ def write_result_file(
     assessment: list[dict],
     gemini_found: set[str] | None,
     gemini_error: str | None,
+    costs: dict[str, dict] | None = None,
+    query_costs: list[dict] | None = None,
+    discovery_info: dict | None = None,
 ) -> None:
-    """Write tests/output/discovery_result.md (with skill assessment table) and discovery_result.csv."""
+    """Write tests/output/discovery_result.md (with skill assessment and navigation cost) and discovery_result.csv."""
     out_dir = ROOT / "tests" / "output"
     out_dir.mkdir(parents=True, exist_ok=True)
     md_path = out_dir / "discovery_result.md"
@@ -277,21 +452,29 @@ def write_result_file(
     col_understand = "AI是否能理解"
     col_reason = "为什么说能理解和调用"
     col_score = "skill描述有效性评分"
+    cost_cols = ["请求数", "索引字节", "总字节", "估计tokens"]
+    cost_keys = ["requests", "index_bytes", "bytes", "tokens"]
+    costs = costs or {}
+
+    def cost_cells(row: dict) -> list:
+        c = costs.get(row.get("url"), {})
+        return [c.get(k, "") for k in cost_keys]
 
     # --- MD: title + table ---
     lines = [
         "# AirSkill 技能发现与描述有效性评估",
         "",
-        "每行一个技能；列：技能 ID、描述、AI 是否能理解并调用、理由、描述有效性评分（1–5）。",
+        "每行一个技能；列：技能 ID、描述、AI 是否能理解并调用、理由、描述有效性评分（1–5），以及代理从主索引导航到该技能的成本（请求数、索引字节、含技能本身的总字节、估计 tokens）。",
         "",
-        "| " + " | ".join([col_skill, col_desc, col_understand, col_reason, col_score]) + " |",
-        "| " + " | ".join(["---"] * 5) + " |",
+        "| " + " | ".join([col_skill, col_desc, col_understand, col_reason, col_score] + cost_cols) + " |",
+        "| " + " | ".join(["---"] * (5 + len(cost_cols))) + " |",
     ]
     for row in assessment:
         # Escape pipe in description/reason for MD
         desc = (row["description"] or "").replace("|", "\\|").replace("\n", " ")
         reason = (row["reason"] or "").replace("|", "\\|").replace("\n", " ")
-        lines.append(f"| {row['skill']} | {desc} | {row['ai_understandable']} | {reason} | {row['score']} |")
+        cells = " | ".join(str(c) for c in cost_cells(row))
+        lines.append(f"| {row['skill']} | {desc} | {row['ai_understandable']} | {reason} | {row['score']} | {cells} |")
     lines.extend(["", "---", ""])
 
     # --- MD: 汇总 (原 §1, 1.5, 2, 3) ---
@@ -329,7 +512,13 @@ def write_result_file(
         missing_in_group = expected_listed - found_in_content
         status = "PASS" if not missing_in_group else "FAIL"
         lines.append(f"- **{group_name}**: {status} (expected {len(expected_listed)} sub-skills, listed {len(listed_in_index)})")
-    lines.extend(["", "### 3. Gemini discovery (optional)", ""])
+    lines.extend(["", "### 3. LLM discovery (optional)", ""])
+    if discovery_info:
+        lines.append(
+            f"- **Run**: model `{discovery_info['model']}`, mode {discovery_info['mode']}, "
+            f"{discovery_info.get('prompts', 1)} prompt(s), {discovery_info['elapsed']:.2f}s"
+            + (f", jobs {discovery_info['jobs']}, cache hits {discovery_info['cache_hits']}" if "jobs" in discovery_info else "")
+        )
     if gemini_error:
         lines.append(f"- **Status**: ERROR — {gemini_error}")
     elif gemini_found is not None:
@@ -345,13 +534,28 @@ def write_result_file(
                 lines.append(f"- **Extra**: {len(extra_g)}")
     else:
         lines.append("- **Status**: Skipped (GEMINI_API_KEY not set).")
+    lines.extend(["", "### 4. Navigation cost (simulated agent)", ""])
+    if costs:
+        lines.append("主索引 → 组 index.md（分组技能）→ 技能本身；字节按 UTF-8 计，tokens 为估算（ASCII 约 4 字符/token，非 ASCII 约 1 字符/token）。")
+        lines.append("")
+        cost_rows = [costs[u] for u in sorted(costs)]
+        lines.extend(_cost_section("4.1 All skills", cost_rows))
+        grouped = [c for u, c in sorted(costs.items()) if c["requests"] == 3]
+        if grouped:
+            lines.extend(_cost_section("4.2 Grouped skills (3 requests)", grouped))
+    if query_costs:
+        lines.extend(_cost_section("4.3 Queries (matched)", [q for q in query_costs if q["skill"]]))
+        lines.extend(["| query | skill | 请求数 | 总字节 | 估计tokens |", "| --- | --- | --- | --- | --- |"])
+        for q in query_costs:
+            query = q["query"].replace("|", "\\|")
+            lines.append(f"| {query} | {q['skill'] or '(无匹配)'} | {q.get('requests', 0)} | {q.get('bytes', 0)} | {q.get('tokens', 0)} |")
     lines.append("")
     md_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
 
     # --- CSV ---
     with open(csv_path, "w", newline="", encoding="utf-8") as f:
         w = csv.writer(f)
-        w.writerow([col_skill, col_desc, col_understand, col_reason, col_score])
+        w.writerow([col_skill, col_desc, col_understand, col_reason, col_score] + cost_cols)
         for row in assessment:
             w.writerow([
                 row["skill"],
@@ -359,16 +563,35 @@ def write_result_file(
                 row["ai_understandable"],
                 row["reason"] or "",
                 row["score"],
-            ])
+            ] + cost_cells(row))
 
     print("Result written to:", md_path, "and", csv_path)
 
 
 def main() -> int:
-    expected = get_expected_urls()
-    by_group = get_expected_urls_by_group()
+    ap = argparse.ArgumentParser(description="AirSkill discovery check")
+    ap.add_argument("--queries", type=Path, default=None, help="file with one task query per line; simulates navigation cost to each query's best match")
+    ap.add_argument("--per-group", action="store_true", help="LLM check with one prompt per index, run concurrently and merged")
+    ap.add_argument("--model", choices=("gemini", "stub"), default="gemini", help="stub: offline stand-in model (implies --per-group unless --single)")
+    ap.add_argument("--single", action="store_true", help="with --model stub: use the single giant prompt instead")
+    ap.add_argument("--jobs", "-j", type=int, default=4, help="max concurrent prompts in --per-group mode")
+    ap.add_argument("--stub-latency", type=float, default=0.0, help="seconds of simulated latency per stub call")
+    ap.add_argument("--no-cache", action="store_true", help="do not read or write the per-group LLM answer cache")
+    args = ap.parse_args()
+
+    # One registry sync per run; every helper below works from these rows
+    with Registry(skills_dir=SKILLS_DIR) as reg:
+        reg.sync()
+        records = reg.skills(include_index=True)
+        expected = get_expected_urls(records)
+        costs = simulate_navigation_cost(expected)
+        query_costs = None
+        if args.queries:
+            queries = [q.strip() for q in args.queries.read_text(encoding="utf-8").splitlines() if q.strip()]
+            query_costs = simulate_query_costs(reg, queries, costs)
+    by_group = get_expected_urls_by_group(records)
     index_text = get_index_text()
-    group_texts = get_group_index_texts()
+    group_texts = get_group_index_texts(records)
 
     print("Expected URLs (from filesystem):", len(expected))
 
@@ -379,12 +602,14 @@ def main() -> int:
     generic_groups = [sid for sid, summary in group_rows if summary.strip() == GENERIC_GROUP_SUMMARY]
 
     assessment = build_skill_assessment(expected, parsed, index_text, group_texts)
+    tokens = cost_distribution(list(costs.values()), "tokens")
+    print(f"Navigation cost (est. tokens per skill): p50 {tokens['p50']}, p90 {tokens['p90']}, max {tokens['max']}")
 
     if missing_in_manifest:
         print("FAIL (manifest): Index content does not list these URLs:", file=sys.stderr)
         for u in sorted(missing_in_manifest):
             print("  ", u, file=sys.stderr)
-        write_result_file(expected, parsed, by_group, group_texts, group_rows, assessment, None, None)
+        write_result_file(expected, parsed, by_group, group_texts, group_rows, assessment, None, None, costs, query_costs)
         return 1
     if generic_groups:
         print("FAIL (group summaries): Root index group row(s) use generic Summary; AI cannot tell what the group is for:", generic_groups, file=sys.stderr)
@@ -393,21 +618,30 @@ def main() -> int:
     api_key = os.environ.get("GEMINI_API_KEY", "").strip()
     gemini_found = None
     gemini_error = None
+    discovery_info = None
 
-    if api_key:
+    if args.model == "stub" or api_key:
         try:
-            response_text = run_gemini(api_key, index_text, group_texts)
-            gemini_found = parse_urls_from_response(response_text)
-            print("URLs Gemini reported:", len(gemini_found))
+            model = StubModel(args.stub_latency) if args.model == "stub" else GeminiModel(api_key)
+            if args.per_group or (args.model == "stub" and not args.single):
+                gemini_found, discovery_info = run_discovery_per_group(
+                    model, index_text, group_texts, jobs=args.jobs, use_cache=not args.no_cache
+                )
+            else:
+                t0 = time.perf_counter()
+                response_text = run_gemini(api_key, index_text, group_texts, model=model)
+                gemini_found = parse_urls_from_response(response_text)
+                discovery_info = {"model": model.name, "mode": "single prompt", "elapsed": time.perf_counter() - t0}
+            print(f"URLs {model.name} reported:", len(gemini_found), f"({discovery_info['mode']}, {discovery_info['elapsed']:.2f}s)")
         except Exception as e:
             gemini_error = str(e)
             print("Gemini error:", e, file=sys.stderr)
-            write_result_file(expected, parsed, by_group, group_texts, group_rows, assessment, None, gemini_error)
+            write_result_file(expected, parsed, by_group, group_texts, group_rows, assessment, None, gemini_error, costs, query_costs, discovery_info)
             return 0  # index build checks passed; Gemini optional
     else:
         print("Set GEMINI_API_KEY to run Gemini discovery test (optional).")
 
-    write_result_file(expected, parsed, by_group, group_texts, group_rows, assessment, gemini_found, gemini_error)
+    write_result_file(expected, parsed, by_group, group_texts, group_rows, assessment, gemini_found, gemini_error, costs, query_costs, discovery_info)
 
     if generic_groups:
         return 1
@@ -416,10 +650,10 @@ def main() -> int:
         missing = expected - gemini_found
         extra = gemini_found - expected
         if not missing and not extra:
-            print("PASS (Gemini): AI discovered all skill .md files and no spurious URLs.")
+            print("PASS (LLM): AI discovered all skill .md files and no spurious URLs.")
             return 0
         if missing:
-            print("FAIL (Gemini): Missing URLs (expected but not reported by AI):", file=sys.stderr)
+            print("FAIL (LLM): Missing URLs (expected but not reported by AI):", file=sys.stderr)
             for u in sorted(missing):
                 print("  ", u, file=sys.stderr)
         if extra: